@@ -1,6 +1,8 @@
 import adsk.core
 import adsk.fusion
 
+from ...lib import fusion360utils as futil
+
 
 # https://khkgears.net/new/gear_knowledge/abcs_of_gears-b/basic_gear_terminology_calculation.html
 class Rack:
@@ -31,6 +33,33 @@ class Rack:
 
         backlash_expr = f"({backlash_value.expression})"
 
+        # bottom box height
+        bottom_box_height_expr = f"1 {units_mgr.defaultLengthUnits}"
+
+        # create component
+        comp_occurrence = design.rootComponent.occurrences.addNewComponent(adsk.core.Matrix3D.create())
+        comp = comp_occurrence.component
+        if name:
+            comp.name = name
+
+        # a preview is rebuilt on every input change, so its dimensions use the input expressions directly instead of
+        # adding the named inputs to the design each time
+        expr_name = None if preview else name
+        if expr_name:
+            # named inputs for the rack dimensions to reference, these are design-wide user parameters that are not
+            # removed with the rack component
+            pressure_angle_expr = futil.add_user_parameter(
+                design, f"{name}_pressureAngle", pressure_angle_expr, "deg"
+            )
+            number_of_teeth_expr = futil.add_user_parameter(
+                design, f"{name}_numberOfTeeth", number_of_teeth_expr, ""
+            )
+            module_expr = futil.add_user_parameter(
+                design, f"{name}_module", module_expr, units_mgr.defaultLengthUnits
+            )
+
+        gear_thickness_input = adsk.core.ValueInput.createByString(gear_thickness_expr)
+
         # dedendum (hf)
         dedendum_expr = f"( 1.25 * {module_expr} )"
 
@@ -43,15 +72,6 @@ class Rack:
         # height
         height_expr = f"({module_expr} + {dedendum_expr})"
 
-        # bottom box height
-        bottom_box_height_expr = f"1 {units_mgr.defaultLengthUnits}"
-
-        # create component
-        comp_occurrence = design.rootComponent.occurrences.addNewComponent(adsk.core.Matrix3D.create())
-        comp = comp_occurrence.component
-        if name:
-            comp.name = name
-
         # construction sketch
         construction_sketch = Rack.__create_construction_sketch(
             comp,
@@ -63,7 +83,12 @@ class Rack:
         )
 
         # extrude bottom box
-        bottom_box_extrude = Rack.__extrude_bottom_box(comp, construction_sketch, gear_thickness_expr, name)
+        bottom_box_extrude = Rack.__extrude_bottom_box(comp, construction_sketch, gear_thickness_input, name)
+        if expr_name:
+            # the tooth is extruded by the same thickness, name the extrude distance so it can follow the parameter
+            gear_thickness_parameter = adsk.fusion.DistanceExtentDefinition.cast(bottom_box_extrude.extentOne).distance
+            gear_thickness_parameter.name = f"{name}_thickness"
+            gear_thickness_input = adsk.core.ValueInput.createByString(gear_thickness_parameter.name)
 
         # tooth sketch
         tooth_sketch = Rack.__create_tooth_sketch(
@@ -79,10 +104,12 @@ class Rack:
         )
 
         # extrude tooth
-        tooth_extrude = Rack.__extrude_tooth(comp, tooth_sketch, gear_thickness_expr, name)
+        tooth_extrude = Rack.__extrude_tooth(comp, tooth_sketch, gear_thickness_input, name)
 
         # combine bottom and tooth to make a better pattern
-        bottom_tooth_combine = Rack.__combine_bottom_and_tooth(comp, bottom_box_extrude, tooth_extrude, name)
+        bottom_tooth_combine = futil.join_body_into(
+            comp, bottom_box_extrude, tooth_extrude, f"{name}_combineToothBody"
+        )
 
         # linear pattern for number of teeth
         tooth_pattern = Rack.__create_tooth_linear_pattern(
@@ -122,6 +149,9 @@ class Rack:
         center_point = sketch.originPoint
         sketch.isComputeDeferred = True
 
+        # dimension text position, the dimensions copy it so all of them can share one point
+        text_point = adsk.core.Point3D.create(1, 10, 0)
+
         length_expr = f"{number_of_teeth_expr} * {pitch_expr}"
 
         pitch_line = sketch.sketchCurves.sketchLines.addByTwoPoints(
@@ -136,7 +166,7 @@ class Rack:
             pitch_line.startSketchPoint,
             center_point,
             adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
-            adsk.core.Point3D.create(1, 10, 0),
+            text_point,
         )
         d.parameter.expression = dedendum_expr
         if name:
@@ -146,7 +176,7 @@ class Rack:
             pitch_line.startSketchPoint,
             pitch_line.endSketchPoint,
             adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
-            adsk.core.Point3D.create(1, 10, 0),
+            text_point,
         )
         d.parameter.expression = length_expr
         if name:
@@ -163,7 +193,7 @@ class Rack:
             body_rect[0].startSketchPoint,
             body_rect[0].endSketchPoint,
             adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
-            adsk.core.Point3D.create(1, 10, 0),
+            text_point,
         )
         d.parameter.expression = bottom_box_height_expr
         if name:
@@ -173,7 +203,7 @@ class Rack:
             body_rect[1].startSketchPoint,
             body_rect[1].endSketchPoint,
             adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
-            adsk.core.Point3D.create(1, 10, 0),
+            text_point,
         )
         d.parameter.expression = length_expr
         if name:
@@ -207,6 +237,11 @@ class Rack:
         center_point = sketch.originPoint
         sketch.isComputeDeferred = True
 
+        # dimension text positions
+        text_point = adsk.core.Point3D.create(0, 10, 0)
+        height_text_point = adsk.core.Point3D.create(0, 5, 0)
+        width_text_point = adsk.core.Point3D.create(1, -1, 0)
+
         # draw root line left
         root_line_left = sketch.sketchCurves.sketchLines.addByTwoPoints(
             adsk.core.Point3D.create(1, 1, 0),
@@ -223,7 +258,7 @@ class Rack:
         sketch.geometricConstraints.addCoincident(face_line_left.startSketchPoint, root_line_left.endSketchPoint)
 
         d = sketch.sketchDimensions.addAngularDimension(
-            root_line_left, face_line_left, adsk.core.Point3D.create(0, 10, 0)
+            root_line_left, face_line_left, text_point
         )
         d.parameter.expression = f"{pressure_angle_expr} + 90 deg"
         if name:
@@ -233,7 +268,7 @@ class Rack:
             face_line_left.startSketchPoint,
             face_line_left.endSketchPoint,
             adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
-            adsk.core.Point3D.create(0, 5, 0),
+            height_text_point,
         )
         d.parameter.expression = f"{height_expr}"
         if name:
@@ -255,7 +290,7 @@ class Rack:
         sketch.geometricConstraints.addCoincident(face_line_right.startSketchPoint, top_land.endSketchPoint)
 
         d = sketch.sketchDimensions.addAngularDimension(
-            root_line_left, face_line_right, adsk.core.Point3D.create(0, 10, 0)
+            root_line_left, face_line_right, text_point
         )
         d.parameter.expression = f"90 deg - {pressure_angle_expr}"
         if name:
@@ -273,7 +308,7 @@ class Rack:
             face_line_right.startSketchPoint,
             root_line_right.endSketchPoint,
             adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
-            adsk.core.Point3D.create(0, 5, 0),
+            height_text_point,
         )
         d.parameter.expression = f"{height_expr}"
         if name:
@@ -290,7 +325,7 @@ class Rack:
             bottom_box_right.startSketchPoint,
             bottom_box_right.endSketchPoint,
             adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
-            adsk.core.Point3D.create(0, 10, 0),
+            text_point,
         )
         d.parameter.expression = bottom_box_height_expr
         if name:
@@ -322,7 +357,7 @@ class Rack:
             face_line_left.startSketchPoint.geometry,
             0.01,
         )
-        d = sketch.sketchDimensions.addRadialDimension(root_fillet_left, adsk.core.Point3D.create(0, 10, 0))
+        d = sketch.sketchDimensions.addRadialDimension(root_fillet_left, text_point)
         d.parameter.expression = root_fillet_radius_expr
         if name:
             d.parameter.name = f"{name}_rootFilletRadius"
@@ -342,7 +377,7 @@ class Rack:
             root_line_left.startSketchPoint,
             root_line_right.endSketchPoint,
             adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
-            adsk.core.Point3D.create(1, -1, 0),
+            width_text_point,
         )
         d.parameter.expression = pitch_expr
         if name:
@@ -383,7 +418,7 @@ class Rack:
             pitch_line.startSketchPoint,
             pitch_line.endSketchPoint,
             adsk.fusion.DimensionOrientations.HorizontalDimensionOrientation,
-            adsk.core.Point3D.create(1, -1, 0),
+            width_text_point,
         )
         d.parameter.expression = tooth_thickness_expr
         if name:
@@ -396,14 +431,14 @@ class Rack:
     def __extrude_bottom_box(
             comp: adsk.fusion.Component,
             sketch: adsk.fusion.Sketch,
-            gear_thickness_expr: str,
+            gear_thickness_input: adsk.core.ValueInput,
             name: str
     ) -> adsk.fusion.ExtrudeFeature:
         profile = sketch.profiles[0]
 
         rack_feature = comp.features.extrudeFeatures.addSimple(
             profile,
-            adsk.core.ValueInput.createByString(gear_thickness_expr),
+            gear_thickness_input,
             adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
         )
         if name:
@@ -415,14 +450,14 @@ class Rack:
     def __extrude_tooth(
             comp: adsk.fusion.Component,
             sketch: adsk.fusion.Sketch,
-            gear_thickness_expr: str,
+            gear_thickness_input: adsk.core.ValueInput,
             name: str
     ) -> adsk.fusion.ExtrudeFeature:
         profile = sketch.profiles[0]
 
         rack_feature = comp.features.extrudeFeatures.addSimple(
             profile,
-            adsk.core.ValueInput.createByString(gear_thickness_expr),
+            gear_thickness_input,
             adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
         )
         if name:
@@ -430,21 +465,6 @@ class Rack:
             rack_feature.bodies.item(0).name = f"{name}"
         return rack_feature
 
-    @staticmethod
-    def __combine_bottom_and_tooth(
-            comp: adsk.fusion.Component,
-            bottom: adsk.fusion.ExtrudeFeature,
-            tooth: adsk.fusion.Feature,
-            name: str | None
-    ):
-        coll = adsk.core.ObjectCollection.create()
-        coll.add(tooth.bodies[0])
-        i = comp.features.combineFeatures.createInput(bottom.bodies[0], coll)
-        c = comp.features.combineFeatures.add(i)
-        if name:
-            c.name = f"{name}_combineToothBody"
-        return c
-
     @staticmethod
     def __create_tooth_linear_pattern(
             comp: adsk.fusion.Component,
@@ -456,9 +476,7 @@ class Rack:
             pitch_expr: str,
             name: str | None,
     ) -> adsk.fusion.RectangularPatternFeature:
-        entities = adsk.core.ObjectCollection.create()
-        entities.add(tooth_extrude)
-        entities.add(bottom_tooth_combine)
+        entities = adsk.core.ObjectCollection.createWithArray([tooth_extrude, bottom_tooth_combine])
         feature_input = comp.features.rectangularPatternFeatures.createInput(
             entities,
             direction_one_entity,
@@ -471,10 +489,12 @@ class Rack:
             adsk.core.ValueInput.createByReal(1),
             adsk.core.ValueInput.createByReal(1)
         )
+        # the pattern includes the combine that joins the tooth to the body, so every copy has to be recomputed against
+        # the body it joins instead of reusing the result of the first
+        feature_input.patternComputeOption = adsk.fusion.PatternComputeOptions.AdjustPatternCompute
         pattern = comp.features.rectangularPatternFeatures.add(feature_input)
         if name:
             pattern.name = f"{name}_toothLinearPattern"
-            for i in range(len(pattern.bodies)):
-                body = pattern.bodies.item(i)
+            for i, body in enumerate(pattern.bodies):
                 body.name = f"{name}_tooth{i + 1}"
         return pattern
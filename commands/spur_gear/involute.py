@@ -0,0 +1,23 @@
+import math
+
+
+def involute_function(angle: float) -> float:
+    # inv(alpha) = tan(alpha) - alpha, the angle the involute turns by up to the point with pressure angle alpha
+    return math.tan(angle) - angle
+
+
+def roll_angle_at_diameter(base_diameter: float, diameter: float) -> float:
+    # roll angle at which the involute of the base circle crosses the circle of the given diameter
+    return math.sqrt((diameter / base_diameter) ** 2 - 1)
+
+
+def involute_point(base_radius: float, start_angle: float, roll_angle: float) -> tuple[float, float]:
+    # point on the involute of the base circle starting at start_angle and unwound by roll_angle (radians), a
+    # negative roll angle unwinds clockwise
+    angle = start_angle + roll_angle
+    cos_angle = math.cos(angle)
+    sin_angle = math.sin(angle)
+    return (
+        base_radius * (cos_angle + roll_angle * sin_angle),
+        base_radius * (sin_angle - roll_angle * cos_angle),
+    )
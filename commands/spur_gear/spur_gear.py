@@ -4,6 +4,7 @@ import adsk.fusion
 from typing import cast
 
 from ...lib import fusion360utils as futil
+from . import involute
 
 
 # https://khkgears.net/new/gear_knowledge/abcs_of_gears-b/basic_gear_terminology_calculation.html
@@ -19,18 +20,19 @@ class SpurGear:
             rotation_value: adsk.core.ValueCommandInput,
             backlash_value: adsk.core.ValueCommandInput,
             preview: bool,
-            name: str | None,
+            name: str,
     ):
         design = adsk.fusion.Design.cast(app.activeProduct)
         units_mgr = app.activeProduct.unitsManager
 
-        pressure_angle = units_mgr.evaluateExpression(pressure_angle_value.expression, "deg")
+        # the command inputs already hold their expressions evaluated in internal units (cm and radians)
+        pressure_angle = pressure_angle_value.value
         pressure_angle_expr = f"({pressure_angle_value.expression})"
 
-        number_of_teeth = units_mgr.evaluateExpression(number_of_teeth_value.expression, "")
+        number_of_teeth = number_of_teeth_value.value
         number_of_teeth_expr = f"({number_of_teeth_value.expression})"
 
-        module = units_mgr.evaluateExpression(module_value.expression, "cm")
+        module = module_value.value
         module_expr = f"({module_value.expression})"
 
         root_fillet_radius_expr = f"({root_fillet_radius_value.expression})"
@@ -39,76 +41,131 @@ class SpurGear:
 
         rotation_expr = f"({rotation_value.expression})"
 
+        backlash = backlash_value.value
         backlash_expr = f"({backlash_value.expression})"
 
         # dedendum (hf)
         dedendum = 1.25 * module
-        dedendum_expr = f"( 1.25 * {module_expr} )"
 
         # pitch (p) - Pitch is the distance between corresponding points on adjacent teeth
         pitch = math.pi * module
-        pitch_expr = f"( PI * {module_expr} )"
 
         # tooth thickness (s)
         tooth_thickness = pitch / 2
-        tooth_thickness_expr = f"( {pitch_expr} / 2 )"
-        half_tooth_thickness_expr = f"( {tooth_thickness_expr} / 2 )"
+
+        # reference/pitch diameter (d)
+        pitch_diameter = number_of_teeth * module
+
+        # root diameter (df)
+        root_diameter = pitch_diameter - (2 * dedendum)
+
+        # base diameter (db)
+        base_diameter = pitch_diameter * math.cos(pressure_angle)
+
+        # tip/outside diameter (da)
+        outside_diameter = pitch_diameter + (2 * module)
+
+        # half the tooth angle at the base circle where the involute starts, pi / (2 * z) + inv(alpha) with the
+        # involute function inv(alpha) = tan(alpha) - alpha
+        involute_curve_mirror_offset_angle = (
+            math.pi / (2 * number_of_teeth)
+            + involute.involute_function(pressure_angle)
+            - (backlash / (2 * pitch_diameter))
+        )
+
+        # half the angle the tooth spans at the outside circle, the involute crosses it at roll angle
+        # sqrt((da / db)^2 - 1) and turns by inv() of that roll angle on the way out
+        outside_roll_angle = involute.roll_angle_at_diameter(base_diameter, outside_diameter)
+        tooth_top_land_angle = involute_curve_mirror_offset_angle - (outside_roll_angle - math.atan(outside_roll_angle))
+
+        # the involute points are spaced by multiples of the interval in roll angle. The count is baked into the sketch
+        # while the tooth count and pressure angle stay editable, so always reach at least 50 degrees (enough down to
+        # about 8 teeth) and one point past the outside circle of the gear as created
+        tangent_line_interval_deg = 5
+        tangent_line_count = max(10, int(math.degrees(outside_roll_angle) // tangent_line_interval_deg) + 2)
 
         # create component
         comp_occurrence = design.rootComponent.occurrences.addNewComponent(adsk.core.Matrix3D.create())
         comp = comp_occurrence.component
-        if name:
-            comp.name = name
+        comp.name = name
+
+        # a preview is thrown away on the next input change, so it is sized from the evaluated values only and skips
+        # the user parameters and dimension expressions that keep a gear editable
+        if not preview:
+            # the gear dimensions reference these parameters by name instead of each repeating the full expressions.
+            # They are design-wide and stay behind when the gear component is deleted, so keep them to the inputs a
+            # user edits
+            pressure_angle_expr = futil.add_user_parameter(
+                design, f"{name}_pressureAngle", pressure_angle_expr, "deg"
+            )
+            number_of_teeth_expr = futil.add_user_parameter(
+                design, f"{name}_numberOfTeeth", number_of_teeth_expr, ""
+            )
+            module_expr = futil.add_user_parameter(
+                design, f"{name}_module", module_expr, units_mgr.defaultLengthUnits
+            )
+        dedendum_expr = f"( 1.25 * {module_expr} )"
+
+        if preview:
+            gear_thickness_input = adsk.core.ValueInput.createByReal(gear_thickness_value.value)
+        else:
+            gear_thickness_input = adsk.core.ValueInput.createByString(gear_thickness_expr)
 
         sketch_plane = comp.xYConstructionPlane
         sketch_circles = comp.sketches.add(sketch_plane)
-        if name:
+        # the preview sketch and features are gone before anyone could look for them by name
+        if not preview:
             sketch_circles.name = f"{name}_circles"
         sketch_circles.isComputeDeferred = True
         center_point = sketch_circles.originPoint
 
         # reference/pitch circle (d)
-        pitch_diameter = number_of_teeth * module
         pitch_diameter_expr = f"( {number_of_teeth_expr} * {module_expr} )"
+        # the pitch circle does not drive any other geometry, it shows where the gear meshes and exposes a named pitch
+        # diameter parameter
         _, pitch_diameter_expr = SpurGear.__create_pitch_circle(
             sketch_circles,
             center_point,
             pitch_diameter,
             pitch_diameter_expr,
+            preview,
             name
         )
         backlash_angle_expr = f"(({backlash_expr} / 4 / (PI * {pitch_diameter_expr})) * 360 deg)"
 
         # root circle (df)
-        root_diameter = pitch_diameter - (2 * dedendum)
         root_diameter_expr = f"( {pitch_diameter_expr} - (2 * {dedendum_expr}) )"
-        root_circle, root_diameter_expr = SpurGear.__create_root_circle(
-            sketch_circles, center_point, root_diameter, root_diameter_expr, name
+        root_circle, _ = SpurGear.__create_root_circle(
+            sketch_circles, center_point, root_diameter, root_diameter_expr, preview, name
         )
-        root_circle_profiles = futil.find_profiles([root_circle])
+        # the other circles are construction geometry, so the root circle bounds the only profile of the sketch
         root_circle_extrude = comp.features.extrudeFeatures.addSimple(
-            root_circle_profiles[0],
-            adsk.core.ValueInput.createByString(gear_thickness_expr),
+            sketch_circles.profiles.item(0),
+            gear_thickness_input,
             adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
         )
-        if name:
+        if not preview:
             root_circle_extrude.name = f"{name}_circle"
             root_circle_extrude.bodies.item(0).name = f"{name}_circle"
 
-        # base circle (db)
-        base_diameter = pitch_diameter * math.cos(pressure_angle)
+            # the tooth is extruded by the same thickness, name the extrude distance so it can follow the parameter
+            gear_thickness_parameter = adsk.fusion.DistanceExtentDefinition.cast(root_circle_extrude.extentOne).distance
+            gear_thickness_parameter.name = f"{name}_thickness"
+            gear_thickness_input = adsk.core.ValueInput.createByString(gear_thickness_parameter.name)
+
+        # base circle (db), it only anchors the involute construction of the tooth, which a preview does not draw
         base_diameter_expr = f"( {pitch_diameter_expr} * cos({pressure_angle_expr}) )"
-        base_circle, base_diameter_expr = SpurGear.__create_base_circle(
-            sketch_circles,
-            center_point,
-            base_diameter,
-            base_diameter_expr,
-            root_diameter,
-            name
-        )
+        if not preview:
+            base_circle, base_diameter_expr = SpurGear.__create_base_circle(
+                sketch_circles,
+                center_point,
+                base_diameter,
+                base_diameter_expr,
+                root_diameter,
+                name
+            )
 
         # tip/outside circle (da)
-        outside_diameter = (pitch_diameter + 2) * module
         outside_diameter_expr = f"( {pitch_diameter_expr} + (2 * {module_expr}) )"
         outside_circle, outside_diameter_expr = SpurGear.__create_outside_circle(
             sketch_circles,
@@ -116,6 +173,7 @@ class SpurGear:
             outside_diameter,
             outside_diameter_expr,
             root_diameter,
+            preview,
             name
         )
 
@@ -129,33 +187,34 @@ class SpurGear:
             center_axis_input = comp.constructionAxes.createInput()
             center_axis_input.setByCircularFace(root_circle_extrude.faces[0])
             center_axis = comp.constructionAxes.add(center_axis_input)
-            if name:
-                center_axis.name = f"{name}_centerAxis"
+            center_axis.name = f"{name}_centerAxis"
 
             # resizing a gear confuses Fusion 360, so we need to put the tooth top land on a separate sketch to force
             # the computations in the correct order
             sketch_tooth_profile = comp.sketches.add(sketch_plane)
-            if name:
-                sketch_tooth_profile.name = f"{name}_toothProfile"
+            sketch_tooth_profile.name = f"{name}_toothProfile"
+
+            sketch_tooth_profile.isComputeDeferred = True
 
             center_point = sketch_tooth_profile.originPoint
             base_circle = cast(adsk.fusion.SketchCircle, sketch_tooth_profile.project(base_circle).item(0))
             root_circle = cast(adsk.fusion.SketchCircle, sketch_tooth_profile.project(root_circle).item(0))
-            outside_circle = cast(adsk.fusion.SketchCircle, sketch_tooth_profile.project(outside_circle).item(0))
-
-            sketch_tooth_profile.isComputeDeferred = True
 
             # tooth
+            outside_circle = cast(adsk.fusion.SketchCircle, sketch_tooth_profile.project(outside_circle).item(0))
             involute_curve_mirror_line = SpurGear.__create_involute_curve_mirror_line(
-                sketch_tooth_profile, center_point, outside_circle
+                sketch_tooth_profile, center_point, outside_circle, outside_diameter
             )
 
             involute_curve_mirror_offset_angle_expr = (
-                f"( ({half_tooth_thickness_expr} / (PI * {root_diameter_expr})) * 360 deg - {backlash_angle_expr})"
+                f"( 90 deg / {number_of_teeth_expr}"
+                f" + (tan({pressure_angle_expr}) * 1 rad - {pressure_angle_expr})"
+                f" - {backlash_angle_expr} )"
             )
-
-            tangent_line_count = 10
-            tangent_line_interval_deg = 5
+            # roll angle between tangent lines and the length of base circle arc unrolled by it, the base diameter is a
+            # named dimension so the arc length stays short enough to repeat in every tangent line dimension
+            tangent_line_interval_expr = f"{tangent_line_interval_deg} deg"
+            involute_arc_length_expr = f"( PI * {base_diameter_expr} * ({tangent_line_interval_expr} / 360 deg) )"
 
             spline = SpurGear.__create_involute_curve(
                 sketch_tooth_profile,
@@ -163,24 +222,17 @@ class SpurGear:
                 involute_curve_mirror_line,
                 center_point,
                 base_diameter,
-                base_diameter_expr,
+                involute_arc_length_expr,
+                involute_curve_mirror_offset_angle,
                 involute_curve_mirror_offset_angle_expr,
                 tangent_line_count,
                 tangent_line_interval_deg,
+                tangent_line_interval_expr,
                 True,
+                name,
             )
-            mirror_spline = SpurGear.__create_involute_curve(
-                sketch_tooth_profile,
-                base_circle,
-                involute_curve_mirror_line,
-                center_point,
-                base_diameter,
-                base_diameter_expr,
-                involute_curve_mirror_offset_angle_expr,
-                tangent_line_count,
-                tangent_line_interval_deg,
-                False,
-            )
+            # the other flank follows the first through a symmetry constraint instead of its own construction
+            mirror_spline = futil.mirror_sketch_spline(sketch_tooth_profile, spline, involute_curve_mirror_line)
 
             # create lines from involute curve to root circle
             dedendum_line_a = SpurGear.__create_dedendum_line(sketch_tooth_profile, center_point, spline)
@@ -198,8 +250,8 @@ class SpurGear:
             sketch_tooth_profile.isVisible = False
 
             sketch_tooth = comp.sketches.add(sketch_plane)
-            if name:
-                sketch_tooth.name = f"{name}_tooth"
+            sketch_tooth.name = f"{name}_tooth"
+            sketch_tooth.isComputeDeferred = True
 
             center_point = sketch_tooth.originPoint
             spline = cast(adsk.fusion.SketchFittedSpline, sketch_tooth.project(spline).item(0))
@@ -218,12 +270,16 @@ class SpurGear:
                 mirror_spline,
                 outside_diameter,
                 outside_diameter_expr,
+                tooth_top_land_angle,
             )
 
+            # the tooth profiles are only available once the sketch has been computed
+            sketch_tooth.isComputeDeferred = False
+
             # extrude tooth
             tooth_extrude = SpurGear.__extrude_tooth(
                 comp,
-                gear_thickness_expr,
+                gear_thickness_input,
                 spline,
                 mirror_spline,
                 root_circle,
@@ -236,14 +292,14 @@ class SpurGear:
             )
 
             # combine to create single body when doing circular pattern
-            combined_tooth_and_body = SpurGear.__combine_tooth_with_body(
+            combined_tooth_and_body = futil.join_body_into(
                 comp,
                 root_circle_extrude,
                 tooth_extrude,
-                name
+                f"{name}_combineToothBody"
             )
 
-            tooth_pattern = SpurGear.__create_tooth_circular_pattern(
+            SpurGear.__create_tooth_circular_pattern(
                 comp,
                 tooth_extrude,
                 combined_tooth_and_body,
@@ -265,8 +321,7 @@ class SpurGear:
             group = design.timeline.timelineGroups.add(
                 comp_occurrence.timelineObject.index, rotation.timelineObject.index
             )
-            if name:
-                group.name = name
+            group.name = name
 
         return
 
@@ -276,19 +331,23 @@ class SpurGear:
             center_point: adsk.fusion.SketchPoint,
             root_diameter: float,
             root_diameter_expr: str,
-            name: str | None,
+            preview: bool,
+            name: str,
     ) -> [adsk.fusion.SketchCircle, str]:
+        # the circles share the sketch origin point as their center instead of being constrained to it
         root_circle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
-            adsk.core.Point3D.create(0, 0, 0), root_diameter / 2.0
+            center_point, root_diameter / 2.0
         )
-        sketch.geometricConstraints.addCoincident(root_circle.centerSketchPoint, center_point)
+        # a preview is never re-driven by its parameters and nothing else in the sketch moves the circle, so it keeps
+        # the diameter it was drawn with without a dimension
+        if preview:
+            return root_circle, root_diameter_expr
         d = sketch.sketchDimensions.addDiameterDimension(
             root_circle,
             adsk.core.Point3D.create(-root_diameter / 1.5, root_diameter / 1.5, 0),
         )
         d.parameter.expression = root_diameter_expr
-        if name:
-            d.parameter.name = f"{name}_rootDiameter"
+        d.parameter.name = f"{name}_rootDiameter"
         return root_circle, d.parameter.name
 
     @staticmethod
@@ -298,20 +357,18 @@ class SpurGear:
             base_diameter: float,
             base_diameter_expr: str,
             root_diameter: float,
-            name: str | None,
+            name: str,
     ) -> [adsk.fusion.SketchCircle, str]:
         base_circle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
-            adsk.core.Point3D.create(0, 0, 0), base_diameter / 2.0
+            center_point, base_diameter / 2.0
         )
         base_circle.isConstruction = True
-        sketch.geometricConstraints.addCoincident(base_circle.centerSketchPoint, center_point)
         d = sketch.sketchDimensions.addDiameterDimension(
             base_circle,
             adsk.core.Point3D.create(-root_diameter / 1.5, root_diameter / 1.4, 0),
         )
         d.parameter.expression = base_diameter_expr
-        if name:
-            d.parameter.name = f"{name}_baseDiameter"
+        d.parameter.name = f"{name}_baseDiameter"
         return base_circle, d.parameter.name
 
     @staticmethod
@@ -320,20 +377,21 @@ class SpurGear:
             center_point: adsk.fusion.SketchPoint,
             pitch_diameter: float,
             pitch_diameter_expr: str,
-            name: str | None,
+            preview: bool,
+            name: str,
     ) -> [adsk.fusion.SketchCircle, str]:
         pitch_circle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
-            adsk.core.Point3D.create(0, 0, 0), pitch_diameter / 2.0
+            center_point, pitch_diameter / 2.0
         )
         pitch_circle.isConstruction = True
-        sketch.geometricConstraints.addCoincident(pitch_circle.centerSketchPoint, center_point)
+        if preview:
+            return pitch_circle, pitch_diameter_expr
         d = sketch.sketchDimensions.addDiameterDimension(
             pitch_circle,
             adsk.core.Point3D.create(-pitch_diameter / 1.5, pitch_diameter / 1.2, 0),
         )
         d.parameter.expression = pitch_diameter_expr
-        if name:
-            d.parameter.name = f"{name}_pitchDiameter"
+        d.parameter.name = f"{name}_pitchDiameter"
         return pitch_circle, d.parameter.name
 
     @staticmethod
@@ -343,28 +401,32 @@ class SpurGear:
             outside_diameter: float,
             outside_diameter_expr: str,
             root_diameter: float,
-            name: str | None,
+            preview: bool,
+            name: str,
     ) -> [adsk.fusion.SketchCircle, str]:
         outside_circle = sketch.sketchCurves.sketchCircles.addByCenterRadius(
-            adsk.core.Point3D.create(0, 0, 0), outside_diameter / 2.0
+            center_point, outside_diameter / 2.0
         )
         outside_circle.isConstruction = True
-        sketch.geometricConstraints.addCoincident(outside_circle.centerSketchPoint, center_point)
+        if preview:
+            return outside_circle, outside_diameter_expr
         d = sketch.sketchDimensions.addDiameterDimension(
             outside_circle,
             adsk.core.Point3D.create(-root_diameter / 1.5, root_diameter / 1.3, 0),
         )
         d.parameter.expression = outside_diameter_expr
-        if name:
-            d.parameter.name = f"{name}_outsideDiameter"
+        d.parameter.name = f"{name}_outsideDiameter"
         return outside_circle, d.parameter.name
 
     @staticmethod
     def __create_involute_curve_mirror_line(
-            sketch: adsk.fusion.Sketch, center_point: adsk.fusion.SketchPoint, outside_circle: adsk.fusion.SketchCircle
+            sketch: adsk.fusion.Sketch,
+            center_point: adsk.fusion.SketchPoint,
+            outside_circle: adsk.fusion.SketchCircle,
+            outside_diameter: float,
     ) -> adsk.fusion.SketchLine:
         involute_curve_mirror_line = sketch.sketchCurves.sketchLines.addByTwoPoints(
-            center_point, adsk.core.Point3D.create(1, 0, 0)
+            center_point, adsk.core.Point3D.create(outside_diameter / 2.0, 0, 0)
         )
         involute_curve_mirror_line.isConstruction = True
         sketch.geometricConstraints.addCoincident(involute_curve_mirror_line.endSketchPoint, outside_circle)
@@ -378,43 +440,50 @@ class SpurGear:
             base_circle: adsk.fusion.SketchCircle,
             base_diameter: float,
             involute_curve_mirror_line: adsk.fusion.SketchLine,
+            involute_curve_mirror_offset_angle: float,
             involute_curve_mirror_offset_angle_expr: str,
             tangent_line_count: int,
             tangent_line_interval_deg: float,
+            tangent_line_interval_expr: str,
             clockwise: bool,
+            name: str,
     ) -> list[adsk.fusion.SketchLine]:
         if clockwise:
             sign = 1
         else:
             sign = -1
 
+        # the loop below is the bulk of the sketch construction, look up the API entry points once
+        add_line = sketch.sketchCurves.sketchLines.addByTwoPoints
+        add_coincident = sketch.geometricConstraints.addCoincident
+        add_angular_dimension = sketch.sketchDimensions.addAngularDimension
+        create_point = adsk.core.Point3D.create
+        cos = math.cos
+        sin = math.sin
+
+        # place each radius line at its final angle so the solver does not have to move it
+        base_radius = base_diameter / 2.0
+        tangent_line_interval = math.radians(tangent_line_interval_deg)
         radius_lines: list[adsk.fusion.SketchLine] = []
         for i in range(tangent_line_count):
             if i == 0:
-                y = -sign
+                angle = -sign * involute_curve_mirror_offset_angle
             else:
-                y = sign * (i + 1)
-            radius_line = sketch.sketchCurves.sketchLines.addByTwoPoints(
-                adsk.core.Point3D.create(0, 0, 0),
-                adsk.core.Point3D.create(base_diameter / 2.0, y, 0),
-            )
+                angle = sign * ((i + 1) * tangent_line_interval - involute_curve_mirror_offset_angle)
+            radius_line = add_line(center_point, create_point(base_radius * cos(angle), base_radius * sin(angle), 0))
             radius_line.isConstruction = True
-            sketch.geometricConstraints.addCoincident(radius_line.startSketchPoint, center_point)
-            sketch.geometricConstraints.addCoincident(radius_line.endSketchPoint, base_circle)
-
-            if i == 0:
-                d = sketch.sketchDimensions.addAngularDimension(
-                    involute_curve_mirror_line, radius_line, adsk.core.Point3D.create(base_diameter, -sign, 0)
-                )
-                d.parameter.expression = involute_curve_mirror_offset_angle_expr
-            else:
-                d = sketch.sketchDimensions.addAngularDimension(
-                    radius_lines[0], radius_line, adsk.core.Point3D.create(base_diameter, sign, 0)
-                )
-                d.parameter.expression = f"{i + 1} * {tangent_line_interval_deg} deg"
-
+            add_coincident(radius_line.endSketchPoint, base_circle)
             radius_lines.append(radius_line)
 
+        # drive the radius line angles only once all of them are placed
+        d = add_angular_dimension(involute_curve_mirror_line, radius_lines[0], create_point(base_diameter, -sign, 0))
+        d.parameter.expression = involute_curve_mirror_offset_angle_expr
+        d.parameter.name = f"{name}_involuteOffsetAngle"
+        text_point = create_point(base_diameter, sign, 0)
+        for i, radius_line in enumerate(radius_lines[1:], start=1):
+            d = add_angular_dimension(radius_lines[0], radius_line, text_point)
+            d.parameter.expression = f"{i + 1} * {tangent_line_interval_expr}"
+
         return radius_lines
 
     @staticmethod
@@ -424,24 +493,28 @@ class SpurGear:
             involute_curve_mirror_line: adsk.fusion.SketchLine,
             center_point: adsk.fusion.SketchPoint,
             base_diameter: float,
-            base_diameter_expr: str,
+            involute_arc_length_expr: str,
+            involute_curve_mirror_offset_angle: float,
             involute_curve_mirror_offset_angle_expr: str,
             tangent_line_count: int,
             tangent_line_interval_deg: float,
+            tangent_line_interval_expr: str,
             clockwise: bool,
+            name: str,
     ) -> adsk.fusion.SketchFittedSpline:
-        spline_points = adsk.core.ObjectCollection.create()
-
         radius_lines = SpurGear.__create_involute_curve_radius_construction_lines(
             sketch,
             center_point,
             base_circle,
             base_diameter,
             involute_curve_mirror_line,
+            involute_curve_mirror_offset_angle,
             involute_curve_mirror_offset_angle_expr,
             tangent_line_count,
             tangent_line_interval_deg,
+            tangent_line_interval_expr,
             clockwise,
+            name,
         )
 
         if clockwise:
@@ -449,30 +522,43 @@ class SpurGear:
         else:
             sign = 1
 
-        spline_points.add(radius_lines[0].endSketchPoint)
-        for i in range(1, len(radius_lines)):
-            radius_line: adsk.fusion.SketchLine = radius_lines[i]
-
-            tangent_line = sketch.sketchCurves.sketchLines.addByTwoPoints(
-                radius_line.endSketchPoint,
-                adsk.core.Point3D.create(base_diameter, sign * base_diameter, 0),
-            )
+        base_radius = base_diameter / 2.0
+        tangent_line_interval = math.radians(tangent_line_interval_deg)
+        involute_start_angle = sign * involute_curve_mirror_offset_angle
+
+        # the loop below is the bulk of the sketch construction, look up the API entry points once
+        add_line = sketch.sketchCurves.sketchLines.addByTwoPoints
+        add_tangent = sketch.geometricConstraints.addTangent
+        add_distance_dimension = sketch.sketchDimensions.addDistanceDimension
+        create_point = adsk.core.Point3D.create
+        involute_point = involute.involute_point
+        aligned = adsk.fusion.DimensionOrientations.AlignedDimensionOrientation
+
+        spline_points: list[adsk.fusion.SketchPoint] = [radius_lines[0].endSketchPoint]
+        tangent_line_length_exprs: list[tuple[adsk.fusion.SketchDimension, str]] = []
+        text_point = create_point(base_diameter, sign * base_diameter, 0)
+        for i, radius_line in enumerate(radius_lines[1:], start=1):
+            # end the tangent line on the involute so the solver only has to confirm its position
+            x, y = involute_point(base_radius, involute_start_angle, -sign * (i + 1) * tangent_line_interval)
+            tangent_line = add_line(radius_line.endSketchPoint, create_point(x, y, 0))
             tangent_line.isConstruction = True
-            sketch.geometricConstraints.addTangent(base_circle, tangent_line)
-            spline_points.add(tangent_line.endSketchPoint)
+            add_tangent(base_circle, tangent_line)
+            spline_points.append(tangent_line.endSketchPoint)
 
-            d = sketch.sketchDimensions.addDistanceDimension(
+            d = add_distance_dimension(
                 tangent_line.startSketchPoint,
                 tangent_line.endSketchPoint,
-                adsk.fusion.DimensionOrientations.AlignedDimensionOrientation,
-                adsk.core.Point3D.create(base_diameter, sign * base_diameter, 0),
-            )
-            d.parameter.expression = (
-                f"{i + 1} * PI * {base_diameter_expr} * ({tangent_line_interval_deg} deg / 360 deg)"
+                aligned,
+                text_point,
             )
+            tangent_line_length_exprs.append((d, f"{i + 1} * {involute_arc_length_expr}"))
+
+        # drive the tangent line lengths only once all of them are placed
+        for d, expr in tangent_line_length_exprs:
+            d.parameter.expression = expr
 
         # create involute spline
-        spline = sketch.sketchCurves.sketchFittedSplines.add(spline_points)
+        spline = sketch.sketchCurves.sketchFittedSplines.add(adsk.core.ObjectCollection.createWithArray(spline_points))
         return spline
 
     @staticmethod
@@ -483,11 +569,19 @@ class SpurGear:
             mirror_spline: adsk.fusion.SketchFittedSpline,
             outside_diameter: float,
             outside_diameter_expr: str,
+            tooth_top_land_angle: float,
     ):
+        # start the arc where the involute curves meet the outside circle so the solver barely has to move it, a
+        # pointed tooth still needs a valid arc to start from
+        outside_radius = outside_diameter / 2.0
+        tooth_top_land_angle = max(tooth_top_land_angle, 0.05)
+        x = outside_radius * math.cos(tooth_top_land_angle)
+        y = outside_radius * math.sin(tooth_top_land_angle)
         tooth_top_land = sketch.sketchCurves.sketchArcs.addByCenterStartSweep(
-            center_point, adsk.core.Point3D.create(outside_diameter, -1, 0), 0.1
+            center_point,
+            adsk.core.Point3D.create(x, -y, 0),
+            2 * tooth_top_land_angle,
         )
-        sketch.geometricConstraints.addCoincident(tooth_top_land.centerSketchPoint, center_point)
         d = sketch.sketchDimensions.addDiameterDimension(
             tooth_top_land,
             adsk.core.Point3D.create(outside_diameter, 0, 0),
@@ -503,18 +597,13 @@ class SpurGear:
             center_point: adsk.fusion.SketchPoint,
             involute_curve_spline: adsk.fusion.SketchFittedSpline,
     ) -> adsk.fusion.SketchLine:
-        line = sketch.sketchCurves.sketchLines.addByTwoPoints(
-            adsk.core.Point3D.create(1, 1, 0),
-            adsk.core.Point3D.create(2, 2, 0),
-        )
-        sketch.geometricConstraints.addCoincident(line.startSketchPoint, center_point)
-        sketch.geometricConstraints.addCoincident(line.endSketchPoint, involute_curve_spline.startSketchPoint)
-        return line
+        # connecting the existing sketch points directly needs no coincident constraints
+        return sketch.sketchCurves.sketchLines.addByTwoPoints(center_point, involute_curve_spline.startSketchPoint)
 
     @staticmethod
     def __extrude_tooth(
             comp: adsk.fusion.Component,
-            gear_thickness_expr: str,
+            gear_thickness_input: adsk.core.ValueInput,
             spline: adsk.fusion.SketchFittedSpline,
             mirror_spline: adsk.fusion.SketchFittedSpline,
             root_circle: adsk.fusion.SketchCircle,
@@ -523,46 +612,48 @@ class SpurGear:
             dedendum_line_b: adsk.fusion.SketchLine,
             root_fillet_radius_a: adsk.fusion.SketchArc,
             root_fillet_radius_b: adsk.fusion.SketchArc,
-            name: str | None,
+            name: str,
     ) -> adsk.fusion.Feature:
-        profiles = adsk.core.ObjectCollection.create()
+        profiles: list[adsk.fusion.Profile] = []
+        profile_entities = futil.find_profile_entities(spline.parentSketch)
 
         # two profiles will be found the inside of tooth profile and all the way around the circle profile
         # we want the smaller of the two
-        found_profiles = futil.find_profiles([dedendum_line_a, dedendum_line_b, root_circle, base_circle])
+        found_profiles = futil.find_profiles(
+            [dedendum_line_a, dedendum_line_b, root_circle, base_circle], profile_entities
+        )
         if len(found_profiles) != 2:
             raise Exception(f"expected 2 profile, found {len(found_profiles)} for spur gear tooth (root)")
-        profiles.add(futil.find_smallest_profile(found_profiles))
+        profiles.append(futil.find_smallest_profile(found_profiles))
 
         # same here, we will find the inner and outer profiles
-        found_profiles = futil.find_profiles([base_circle, spline, mirror_spline])
+        found_profiles = futil.find_profiles([base_circle, spline, mirror_spline], profile_entities)
         if not (len(found_profiles) == 1 or len(found_profiles) == 2):
             raise Exception(f"expected 1 or 2 profile, found {len(found_profiles)} for spur gear tooth (tip)")
-        profiles.add(futil.find_smallest_profile(found_profiles))
+        profiles.append(futil.find_smallest_profile(found_profiles))
 
         # root fillet radius
-        found_profiles = futil.find_profiles([root_fillet_radius_a, dedendum_line_a, root_circle])
+        found_profiles = futil.find_profiles([root_fillet_radius_a, dedendum_line_a, root_circle], profile_entities)
         if not (len(found_profiles) == 1 or len(found_profiles) == 2):
             raise Exception(
                 f"expected 1 or 2 profile, found {len(found_profiles)} for spur gear tooth (fillet radius a)"
             )
-        profiles.add(futil.find_smallest_profile(found_profiles))
+        profiles.append(futil.find_smallest_profile(found_profiles))
 
-        found_profiles = futil.find_profiles([root_fillet_radius_b, dedendum_line_b, root_circle])
+        found_profiles = futil.find_profiles([root_fillet_radius_b, dedendum_line_b, root_circle], profile_entities)
         if not (len(found_profiles) == 1 or len(found_profiles) == 2):
             raise Exception(
                 f"expected 1 or 2 profile, found {len(found_profiles)} for spur gear tooth (fillet radius b)"
             )
-        profiles.add(futil.find_smallest_profile(found_profiles))
+        profiles.append(futil.find_smallest_profile(found_profiles))
 
         tooth_extrude = comp.features.extrudeFeatures.addSimple(
-            profiles,
-            adsk.core.ValueInput.createByString(gear_thickness_expr),
+            adsk.core.ObjectCollection.createWithArray(profiles),
+            gear_thickness_input,
             adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
         )
-        if name:
-            tooth_extrude.name = f"{name}_tooth"
-            tooth_extrude.bodies.item(0).name = f"{name}_tooth0"
+        tooth_extrude.name = f"{name}_tooth"
+        tooth_extrude.bodies.item(0).name = f"{name}_tooth0"
         return tooth_extrude
 
     @staticmethod
@@ -571,35 +662,18 @@ class SpurGear:
             combined_tooth_and_body: adsk.fusion.CombineFeature,
             center_axis: adsk.fusion.ConstructionAxis,
             rotation_expr: str,
-            name: str | None,
+            name: str,
     ) -> adsk.fusion.MoveFeature:
         occurrence = comp.parentDesign.rootComponent.occurrencesByComponent(comp)[0]
         center_axis = center_axis.createForAssemblyContext(occurrence)
-        move_create_input = adsk.core.ObjectCollection.create()
-        move_create_input.add(combined_tooth_and_body.bodies[0])
+        move_create_input = adsk.core.ObjectCollection.createWithArray([combined_tooth_and_body.bodies[0]])
         move_input = comp.features.moveFeatures.createInput2(move_create_input)
         move_input.defineAsRotate(center_axis, adsk.core.ValueInput.createByString(rotation_expr))
         feature = comp.features.moveFeatures.add(move_input)
-        if name:
-            feature.name = f"{name}_rotation"
+        feature.name = f"{name}_rotation"
 
         return feature
 
-    @staticmethod
-    def __combine_tooth_with_body(
-            comp: adsk.fusion.Component,
-            body: adsk.fusion.ExtrudeFeature,
-            tooth: adsk.fusion.Feature,
-            name: str | None,
-    ) -> adsk.fusion.CombineFeature:
-        coll = adsk.core.ObjectCollection.create()
-        coll.add(tooth.bodies[0])
-        i = comp.features.combineFeatures.createInput(body.bodies[0], coll)
-        c = comp.features.combineFeatures.add(i)
-        if name:
-            c.name = f"{name}_combineToothBody"
-        return c
-
     @staticmethod
     def __create_tooth_circular_pattern(
             comp: adsk.fusion.Component,
@@ -607,20 +681,19 @@ class SpurGear:
             combined_tooth_and_body: adsk.fusion.CombineFeature,
             root_circle: adsk.fusion.SketchCircle,
             number_of_teeth_expr: str,
-            name: str | None,
+            name: str,
     ) -> adsk.fusion.CircularPatternFeature:
-        entities = adsk.core.ObjectCollection.create()
-        entities.add(tooth_feature)
-        entities.add(combined_tooth_and_body)
+        entities = adsk.core.ObjectCollection.createWithArray([tooth_feature, combined_tooth_and_body])
         axis = root_circle
         feature_input = comp.features.circularPatternFeatures.createInput(entities, axis)
         feature_input.quantity = adsk.core.ValueInput.createByString(number_of_teeth_expr)
+        # the pattern includes the combine that joins the tooth to the body, so every copy has to be recomputed against
+        # the body it joins instead of reusing the result of the first
+        feature_input.patternComputeOption = adsk.fusion.PatternComputeOptions.AdjustPatternCompute
         pattern = comp.features.circularPatternFeatures.add(feature_input)
-        if name:
-            pattern.name = f"{name}_toothCircularPattern"
-            for i in range(len(pattern.bodies)):
-                body = pattern.bodies.item(i)
-                body.name = f"{name}_tooth{i + 1}"
+        pattern.name = f"{name}_toothCircularPattern"
+        for i, body in enumerate(pattern.bodies):
+            body.name = f"{name}_tooth{i + 1}"
         return pattern
 
     @staticmethod
@@ -630,33 +703,31 @@ class SpurGear:
             root_circle: adsk.fusion.SketchCircle,
             root_fillet_radius_expr: str,
             tooth_thickness: float,
-            name: str | None,
+            name: str,
     ) -> [adsk.fusion.SketchArc, str]:
-        x = root_circle.boundingBox.maxPoint.x
-        if dedendum_line.boundingBox.maxPoint.y > 0:
-            arc = sketch.sketchCurves.sketchArcs.addByThreePoints(
-                adsk.core.Point3D.create(x, tooth_thickness, 0),  # point along root circle
-                adsk.core.Point3D.create(x + 1, tooth_thickness * 0.5, 0),  # mid point
-                adsk.core.Point3D.create(x + 2, tooth_thickness * 0.5, 0),  # point along dedendum line
-            )
-            sketch.geometricConstraints.addCoincident(arc.startSketchPoint, root_circle)
-            sketch.geometricConstraints.addCoincident(arc.endSketchPoint, dedendum_line)
+        # read the sketch geometry directly, a bounding box has to be computed first
+        x = root_circle.radius
+        sign = 1 if dedendum_line.endSketchPoint.geometry.y > 0 else -1
+        root_circle_pt = adsk.core.Point3D.create(x, sign * tooth_thickness, 0)
+        mid_pt = adsk.core.Point3D.create(x + 1, sign * tooth_thickness * 0.5, 0)
+        dedendum_line_pt = adsk.core.Point3D.create(x + 2, sign * tooth_thickness * 0.5, 0)
+        if sign > 0:
+            arc = sketch.sketchCurves.sketchArcs.addByThreePoints(root_circle_pt, mid_pt, dedendum_line_pt)
+            root_circle_point, dedendum_line_point = arc.startSketchPoint, arc.endSketchPoint
         else:
-            arc = sketch.sketchCurves.sketchArcs.addByThreePoints(
-                adsk.core.Point3D.create(x + 2, -tooth_thickness * 0.5, 0),  # point along dedendum line
-                adsk.core.Point3D.create(x + 1, -tooth_thickness * 0.5, 0),  # mid point
-                adsk.core.Point3D.create(x, -tooth_thickness, 0),  # point along root circle
-            )
-            sketch.geometricConstraints.addCoincident(arc.endSketchPoint, root_circle)
-            sketch.geometricConstraints.addCoincident(arc.startSketchPoint, dedendum_line)
+            # the fillet of the lower flank is the mirror image of the upper one, it is drawn from the dedendum line
+            # to the root circle so that it still runs counter clockwise from its start to its end point
+            arc = sketch.sketchCurves.sketchArcs.addByThreePoints(dedendum_line_pt, mid_pt, root_circle_pt)
+            root_circle_point, dedendum_line_point = arc.endSketchPoint, arc.startSketchPoint
+        sketch.geometricConstraints.addCoincident(root_circle_point, root_circle)
+        sketch.geometricConstraints.addCoincident(dedendum_line_point, dedendum_line)
 
         d = sketch.sketchDimensions.addRadialDimension(
             arc,
             adsk.core.Point3D.create(1, 1, 0),
         )
         d.parameter.expression = root_fillet_radius_expr
-        if name:
-            d.parameter.name = f"{name}_rootFilletRadius"
+        d.parameter.name = f"{name}_rootFilletRadius"
 
         sketch.geometricConstraints.addTangent(root_circle, arc)
         sketch.geometricConstraints.addTangent(dedendum_line, arc)
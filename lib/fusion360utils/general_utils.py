@@ -9,7 +9,9 @@
 #  AUTODESK, INC. DOES NOT WARRANT THAT THE OPERATION OF THE PROGRAM WILL BE
 #  UNINTERRUPTED OR ERROR FREE.
 
+import itertools
 import traceback
+from typing import Iterator
 import adsk.core
 import adsk.fusion
 
@@ -40,8 +42,13 @@ def log(
     # Always print to console, only seen through IDE.
     print(message)
 
+    # Nothing else to do for a regular message when not debugging.
+    is_error = level == adsk.core.LogLevels.ErrorLogLevel
+    if not (is_error or DEBUG or force_console):
+        return
+
     # Log all errors to Fusion log file.
-    if level == adsk.core.LogLevels.ErrorLogLevel:
+    if is_error:
         log_type = adsk.core.LogTypes.FileLogType
         app.log(message, level, log_type)
 
@@ -61,71 +68,66 @@ def handle_error(name: str, show_message_box: bool = False):
                         and logged to the log file.
     """
 
+    message = f"{name}\n{traceback.format_exc()}"
     log("===== Error =====", adsk.core.LogLevels.ErrorLogLevel)
-    log(f"{name}\n{traceback.format_exc()}", adsk.core.LogLevels.ErrorLogLevel)
+    log(message, adsk.core.LogLevels.ErrorLogLevel)
 
     # If desired you could show an error as a message box.
     if show_message_box:
-        ui.messageBox(f"{name}\n{traceback.format_exc()}")
+        ui.messageBox(message)
 
 
-def find_profiles(curves: list[adsk.fusion.SketchCurve]) -> list[adsk.fusion.Profile]:
+def find_profiles(
+        curves: list[adsk.fusion.SketchCurve],
+        profile_entities: list[tuple[adsk.fusion.Profile, list[adsk.fusion.SketchEntity]]] | None = None,
+) -> list[adsk.fusion.Profile]:
     if len(curves) == 0:
         return []
-    profiles: [adsk.fusion.Profile] = []
-    sketch = curves[0].parentSketch
-    for profile in sketch.profiles:
-        if profile_contains_curves(profile, curves):
-            profiles.append(profile)
-    return profiles
-
+    if profile_entities is None:
+        profile_entities = find_profile_entities(curves[0].parentSketch)
+    # compare the entities themselves, two entity tokens of the same entity are not guaranteed to be equal strings
+    return [profile for profile, entities in profile_entities if all(curve in entities for curve in curves)]
 
-def profile_contains_curves(profile: adsk.fusion.Profile, curves: list[adsk.fusion.SketchCurve]) -> bool:
-    for curve in curves:
-        if not profile_contains_curve(profile, curve):
-            return False
-    return True
 
+def find_profile_entities(
+        sketch: adsk.fusion.Sketch
+) -> list[tuple[adsk.fusion.Profile, list[adsk.fusion.SketchEntity]]]:
+    """Lists the sketch entities bounding each profile of the sketch.
 
-def profile_contains_curve(profile: adsk.fusion.Profile, curve: adsk.fusion.SketchCurve) -> bool:
-    for loop in profile.profileLoops:
-        for profile_curve in loop.profileCurves:
-            if profile_curve.sketchEntity == curve:
-                return True
-    return False
+    Pass the result to find_profiles when looking up several profiles of the same sketch so the profile loops are
+    only walked once.
+    """
+    return [
+        (profile, [profile_curve.sketchEntity for loop in profile.profileLoops for profile_curve in loop.profileCurves])
+        for profile in sketch.profiles
+    ]
 
 
 def find_smallest_profile(profiles: list[adsk.fusion.Profile]) -> adsk.fusion.Profile:
-    smallest_profile = None
-    smallest_profile_area = 0
-    for profile in profiles:
-        area = (abs(profile.boundingBox.maxPoint.x - profile.boundingBox.minPoint.x)
-                * abs(profile.boundingBox.maxPoint.y - profile.boundingBox.minPoint.y))
-        if smallest_profile is None or area < smallest_profile_area:
-            smallest_profile = profile
-            smallest_profile_area = area
-    return smallest_profile
+    if len(profiles) == 1:
+        return profiles[0]
+    # low accuracy is plenty to tell the profiles apart and is a single call per profile
+    accuracy = adsk.fusion.CalculationAccuracy.LowCalculationAccuracy
+    return min(profiles, key=lambda profile: profile.areaProperties(accuracy).area)
 
 
 def find_next_name(design: adsk.fusion.Design, prefix: str) -> str | None:
-    matching_names = find_names_with_prefix(design, prefix)
-
-    def _is_valid_name(local_proposed_name: str) -> bool:
-        for matching_name in matching_names:
-            if matching_name.startswith(local_proposed_name):
-                return False
-        return True
+    # a proposed name is taken when any existing name starts with it, which only depends on the digits following
+    # the prefix, so collect every leading part of those digits once instead of comparing against every name
+    taken_numbers: set[str] = set()
+    for matching_name in find_names_with_prefix(design, prefix):
+        digits = "".join(itertools.takewhile(str.isdigit, matching_name[len(prefix):]))
+        taken_numbers.update(digits[:i] for i in range(1, len(digits) + 1))
 
     for i in range(1, 100000):
-        proposed_name = f'{prefix}{i}'
-        if _is_valid_name(proposed_name):
-            return proposed_name
+        if str(i) not in taken_numbers:
+            return f'{prefix}{i}'
 
     return None
 
 
 def is_name_taken(design: adsk.fusion.Design, prefix: str) -> bool:
-    return len(find_names_with_prefix(design, prefix)) > 0
+    return next(_iter_names_with_prefix(design, prefix), None) is not None
 
 
 def is_valid_name(name: str) -> bool:
@@ -133,20 +135,55 @@ def is_valid_name(name: str) -> bool:
 
 
 def find_names_with_prefix(design: adsk.fusion.Design, prefix: str) -> list[str]:
-    results: list[str] = []
+    return list(_iter_names_with_prefix(design, prefix))
+
+
+def _iter_names_with_prefix(design: adsk.fusion.Design, prefix: str) -> Iterator[str]:
+    # each name is an API property read, so read it once for the test and the result. User parameters are included
+    # because adding one with a name that is already used fails, so the name of a deleted gear stays taken until its
+    # parameters are deleted as well
+    for param in design.userParameters:
+        param_name = param.name
+        if param_name.startswith(prefix):
+            yield param_name
     for occ in design.rootComponent.occurrences:
-        for sketch in occ.component.sketches:
+        component = occ.component
+        for sketch in component.sketches:
             for dim in sketch.sketchDimensions:
-                if dim.parameter.name.startswith(prefix):
-                    results.append(dim.parameter.name)
-        for extrude in occ.component.features.extrudeFeatures:
-            if extrude.name.startswith(prefix):
-                results.append(extrude.name)
-    return results
+                dim_name = dim.parameter.name
+                if dim_name.startswith(prefix):
+                    yield dim_name
+        for extrude in component.features.extrudeFeatures:
+            extrude_name = extrude.name
+            if extrude_name.startswith(prefix):
+                yield extrude_name
+
+
+def join_body_into(
+        comp: adsk.fusion.Component,
+        target: adsk.fusion.Feature,
+        tool: adsk.fusion.Feature,
+        feature_name: str,
+) -> adsk.fusion.CombineFeature:
+    coll = adsk.core.ObjectCollection.createWithArray([tool.bodies[0]])
+    i = comp.features.combineFeatures.createInput(target.bodies[0], coll)
+    c = comp.features.combineFeatures.add(i)
+    c.name = feature_name
+    return c
+
+
+def add_user_parameter(design: adsk.fusion.Design, name: str, expression: str, units: str) -> str:
+    """Adds a user parameter to the design and returns its name for use in expressions.
+
+    User parameters belong to the design, not to a component. Deleting the component that uses the parameter leaves
+    it behind, and it has to be removed from the Parameters dialog by hand.
+    """
+    param = design.userParameters.add(name, adsk.core.ValueInput.createByString(expression), units, "")
+    return param.name
 
 
 def vector3d_from_pts(pt1: adsk.core.Point3D, pt2: adsk.core.Point3D) -> adsk.core.Vector3D:
-    return adsk.core.Vector3D.create(pt2.x - pt1.x, pt2.x - pt1.x, pt2.x - pt1.x)
+    return adsk.core.Vector3D.create(pt2.x - pt1.x, pt2.y - pt1.y, pt2.z - pt1.z)
 
 
 def attribute_value_as_value_input(attr: adsk.core.Attribute | None, default_value: str) -> adsk.core.ValueInput:
@@ -6,11 +6,13 @@ def mirror_sketch_spline(
     sketch: adsk.fusion.Sketch, spline: adsk.fusion.SketchFittedSpline, mirror_line: adsk.fusion.SketchLine
 ) -> adsk.fusion.SketchFittedSpline:
     # see https://stackoverflow.com/a/8954454/39431
-    x1 = mirror_line.startSketchPoint.geometry.x
-    x2 = mirror_line.endSketchPoint.geometry.x
-    y1 = mirror_line.startSketchPoint.geometry.y
-    y2 = mirror_line.endSketchPoint.geometry.y
-    z = mirror_line.startSketchPoint.geometry.z
+    start = mirror_line.startSketchPoint.geometry
+    end = mirror_line.endSketchPoint.geometry
+    x1 = start.x
+    x2 = end.x
+    y1 = start.y
+    y2 = end.y
+    z = start.z
 
     a = y2 - y1
     b = -(x2 - x1)
@@ -19,16 +21,21 @@ def mirror_sketch_spline(
     a_p = a / m
     b_p = b / m
     c_p = c / m
+    two_a_p = 2 * a_p
+    two_b_p = 2 * b_p
 
-    mirror_spline_points = adsk.core.ObjectCollection.create()
+    mirror_spline_points = []
     for pt in spline.fitPoints:
-        px = pt.geometry.x
-        py = pt.geometry.y
+        geometry = pt.geometry
+        px = geometry.x
+        py = geometry.y
         d = (a_p * px) + (b_p * py) + c_p
-        px_p = px - (2 * a_p * d)
-        py_p = py - (2 * b_p * d)
-        mirror_spline_points.add(adsk.core.Point3D.create(px_p, py_p, z))
-    mirror_spline = sketch.sketchCurves.sketchFittedSplines.add(mirror_spline_points)
+        px_p = px - (two_a_p * d)
+        py_p = py - (two_b_p * d)
+        mirror_spline_points.append(adsk.core.Point3D.create(px_p, py_p, z))
+    mirror_spline = sketch.sketchCurves.sketchFittedSplines.add(
+        adsk.core.ObjectCollection.createWithArray(mirror_spline_points)
+    )
 
     sketch.geometricConstraints.addSymmetry(spline, mirror_spline, mirror_line)
 